@@ -3,32 +3,55 @@ ABNF parser
 """
 
 from typing import Optional
-import base64
+from base64 import b64decode
+import re
+import string
+
+# Character classes from sexp.abnf, built once at import time.
+_ALPHA = frozenset(string.ascii_letters)
+_DIGITS = frozenset(string.digits)
+_HEXDIGITS = frozenset(string.hexdigits)
+_BASE_64_CHARS = frozenset(string.ascii_letters + string.digits + "+/")
+_WHITESPACE = frozenset(" \t\x0b\r\n")
+_WHITESPACE_RUN = re.compile(r"[ \t\x0b\r\n]*")
+_DIGIT_RUN = re.compile(r"[0-9]*")
+_HEXDIGIT_RUN = re.compile(r"[0-9a-fA-F]*")
+_BASE_64_CHARS_RUN = re.compile(r"(?:[A-Za-z0-9+/][ \t\x0b\r\n]*)*")
+_BASE_64_INVALID = re.compile(r"[^A-Za-z0-9+/=\s]")
+_DROP_WHITESPACE = str.maketrans("", "", " \t\x0b\r\n")
 
 
 class SexpParser:
+    __slots__ = ("text", "text_length", "index")
+
     def __init__(self, text: str):
         self.text = text
         self.text_length = len(text)
         self.index = 0
 
+    def reset(self, text: str) -> None:
+        """Start over on new input, reusing this parser"""
+        self.text = text
+        self.text_length = len(text)
+        self.index = 0
+
     def at_end(self) -> bool:
         """Check if we've reached the end of input"""
         return self.index >= self.text_length
 
     def peek(self) -> Optional[str]:
         """Look at current character without consuming it"""
-        if self.at_end():
-            return None
-        return self.text[self.index]
+        if self.index < self.text_length:
+            return self.text[self.index]
+        return None
 
     def consume(self) -> Optional[str]:
         """Consume and return current character"""
-        if self.at_end():
-            return None
-        char = self.text[self.index]
-        self.index += 1
-        return char
+        index = self.index
+        if index < self.text_length:
+            self.index = index + 1
+            return self.text[index]
+        return None
 
     # parsing primitives; sexp.abnf definition comes later.
     def parse_sp(self) -> bool:
@@ -61,16 +84,14 @@ class SexpParser:
 
     def parse_alpha(self) -> bool:
         """Parse ALPHA character - %x41-5A / %x61-7A (A-Z / a-z)"""
-        char = self.peek()
-        if char and (char.isalpha()):
+        if self.peek() in _ALPHA:
             self.consume()
             return True
         return False
 
     def parse_digit(self) -> bool:
         """Parse DIGIT character - %x30-39 (0-9)"""
-        char = self.peek()
-        if char and char.isdigit():
+        if self.peek() in _DIGITS:
             self.consume()
             return True
         return False
@@ -78,7 +99,7 @@ class SexpParser:
     def parse_hexdigit(self) -> bool:
         """Parse HEXDIG character - DIGIT / "A" / "B" / "C" / "D" / "E" / "F" / "a" / "b" / "c" / "d" / "e" / "f"""
         char = self.peek()
-        if char and char.lower() in "0123456789abcdef":
+        if char in _HEXDIGITS:
             self.consume()
             return True
         return False
@@ -127,18 +148,22 @@ class SexpParser:
 
         Implements: whitespace = SP / HTAB / vtab / CR / LF / ff
         """
-        if self.parse_sp():
-            return True
-        if self.parse_htab():
-            return True
-        if self.parse_vtab():
-            return True
-        if self.parse_cr():
-            return True
-        if self.parse_lf():
+        if self.peek() in _WHITESPACE:
+            self.consume()
             return True
         return False
 
+    def skip_whitespace(self) -> int:
+        """
+        Skip a run of whitespace characters in one regex match. Returns the
+        number of characters skipped.
+
+        Implements: *whitespace
+        """
+        start = self.index
+        self.index = _WHITESPACE_RUN.match(self.text, start).end()
+        return self.index - start
+
     def parse_base_64_char(self) -> bool:
         """
         Parse base64 character (A-Z, a-z, 0-9, '+', '/')
@@ -146,7 +171,7 @@ class SexpParser:
         Implements: base-64-char = ALPHA / DIGIT / "+" / "/"
         """
         char = self.peek()
-        if char and (char.isalpha() or char.isdigit() or char in "+/"):
+        if char in _BASE_64_CHARS:
             self.consume()
             return True
         return False
@@ -162,25 +187,15 @@ class SexpParser:
         whitespace. Returns total count of base64 chars parsed. Raises
         ValueError if the number of base64 characters is not divisible by 4.
         """
-        count = 0
-        while True:
-            group_count = 0
-            for _ in range(4):
-                if self.parse_base_64_char():
-                    group_count += 1
-                    while self.parse_whitespace():
-                        pass
-                else:
-                    break
-            if group_count == 4:
-                count += 4
-            else:
-                break
-        if (count + group_count) % 4 != 0:
+        run = _BASE_64_CHARS_RUN.match(self.text, self.index).group()
+        self.index += len(run)
+        total = len(run.translate(_DROP_WHITESPACE))
+        count = total - total % 4
+        if total != count:
             raise ValueError(
                 f"Invalid base64 character count: {count} (must be multiple of 4)"
             )
-        return count + group_count
+        return total
 
     def parse_base_64_end(self) -> int:
         """
@@ -212,8 +227,7 @@ class SexpParser:
             for _ in range(3):
                 if self.parse_base_64_char() or self.peek() == "=":
                     count += 1
-                    while self.parse_whitespace():
-                        pass
+                    self.skip_whitespace()
                 else:
                     break
             if count == 3:
@@ -221,8 +235,7 @@ class SexpParser:
                 while self.peek() == "=":
                     self.consume()
                     pad_count += 1
-                    while self.parse_whitespace():
-                        pass
+                    self.skip_whitespace()
                 # Only one padding allowed for this case
                 if pad_count <= 1:
                     return count
@@ -237,8 +250,7 @@ class SexpParser:
             for _ in range(2):
                 if self.parse_base_64_char():
                     count += 1
-                    while self.parse_whitespace():
-                        pass
+                    self.skip_whitespace()
                 else:
                     break
             if count == 2:
@@ -247,8 +259,7 @@ class SexpParser:
                     if self.peek() == "=":
                         self.consume()
                         pad_count += 1
-                        while self.parse_whitespace():
-                            pass
+                        self.skip_whitespace()
                 if pad_count == 2:
                     return count
         except ValueError:
@@ -263,8 +274,7 @@ class SexpParser:
         Returns None if no digits found.
         """
         start = self.index
-        while self.parse_digit():
-            pass
+        self.index = _DIGIT_RUN.match(self.text, start).end()
         if self.index > start:
             return int(self.text[start : self.index])
         return None
@@ -286,38 +296,32 @@ class SexpParser:
         self.consume()
 
         # Skip any whitespace
-        while self.parse_whitespace():
-            pass
-
-        # Collect base64 chars (with possible whitespace between)
-        b64_chars = []
-        while True:
-            char = self.peek()
-            if char is None or char == "|":
-                break
-            if char.isspace():
-                self.consume()
-                continue
-            if char in "+/=" or char.isalnum():
-                b64_chars.append(char)
-                self.consume()
-            else:
-                # Invalid character in base64
-                raise ValueError(
-                    f"Invalid base64 character '{char}' at position {self.index}"
-                )
+        self.skip_whitespace()
+
+        # Everything up to the next '|' is base64 chars and whitespace
+        end = self.text.find("|", self.index)
+        if end == -1:
+            end = self.text_length
+        body = self.text[self.index : end]
+        invalid = _BASE_64_INVALID.search(body)
+        if invalid:
+            self.index += invalid.start()
+            raise ValueError(
+                f"Invalid base64 character '{invalid.group()}' at position {self.index}"
+            )
+        self.index = end
 
         # Closing delimiter
         if self.peek() != "|":
             raise ValueError(f"Missing closing '|' for base64 at position {self.index}")
         self.consume()
 
-        # Join and decode
-        b64_str = "".join(b64_chars)
+        # Drop the whitespace and decode
+        b64_str = "".join(body.split())
         if not b64_str:
             return ""
         try:
-            decoded = base64.b64decode(b64_str, validate=True)
+            decoded = b64decode(b64_str, validate=True)
             # Try to decode as UTF-8, fallback to bytes
             try:
                 return decoded.decode("utf-8")
@@ -332,8 +336,7 @@ class SexpParser:
         Returns empty string if no hex digits found.
         """
         start = self.index
-        while self.parse_hexdigit():
-            pass
+        self.index = _HEXDIGIT_RUN.match(self.text, start).end()
         return self.text[start : self.index]
 
     def parse_hexadecimal(self) -> Optional[int]:
@@ -341,9 +344,7 @@ class SexpParser:
         Parse a sequence of hexadecimal digits and return as int.
         Returns None if no hex digits found.
         """
-        start = self.index
-        while self.parse_hexdigit():
-            pass
-        if self.index > start:
-            return int(self.text[start : self.index], 16)
+        digits = self.parse_hexadecimals()
+        if digits:
+            return int(digits, 16)
         return None
@@ -0,0 +1,16 @@
+"""
+Shared pytest configuration.
+"""
+
+import os
+
+from hypothesis import HealthCheck, settings
+
+# `HYPOTHESIS_PROFILE=ci pytest` trades example count for wall time.
+settings.register_profile(
+    "ci",
+    max_examples=20,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+settings.load_profile(os.environ.get("HYPOTHESIS_PROFILE", "default"))
@@ -3,10 +3,24 @@ Tests for our minimal ABNF parser
 Starting with the most basic elements
 """
 
+import re
+import string
+
 import pytest
 from sexp.parser import SexpParser
-from sexp.gen import sexp_gen
-from hypothesis import given
+
+# The single-character classes are small enough to test exhaustively.
+_ALPHA = string.ascii_letters
+_DIGITS = string.digits
+_HEXDIGITS = string.hexdigits
+_NON_HEX_ALPHA = "".join(c for c in _ALPHA if c not in _HEXDIGITS)
+_BASE_64_ALPHABET = (
+    string.ascii_uppercase + string.ascii_lowercase + string.digits + "+/"
+)
+
+# Oracles for how far the multi-character rules should consume.
+_DIGIT_PREFIX = re.compile(r"[0-9]*")
+_HEX_PREFIX = re.compile(r"[0-9a-fA-F]*")
 
 
 class TestBasicUtilityMethods:
@@ -18,19 +32,34 @@ class TestBasicUtilityMethods:
         result = parser.consume()
         assert result is None
 
+    def test_reset(self):
+        """Test reset rewinds the parser onto new input"""
+        parser = SexpParser("abc")
+        parser.consume()
+        parser.reset(" x")
+        assert parser.index == 0
+        assert parser.parse_sp() is True
+        assert parser.peek() == "x"
+
+    def test_reset_empty_string(self):
+        """Test reset onto empty input leaves the parser at the end"""
+        parser = SexpParser("abc")
+        parser.reset("")
+        assert parser.at_end()
+        assert parser.consume() is None
+
 
 class TestParseSpMethod:
     """Tests for parse_sp method (space character parsing)"""
 
-    @given(sexp_gen.sp)
-    def test_parse_sp_success(self, s: str):
+    def test_parse_sp_success(self):
         """Test parsing a space character successfully"""
-        parser = SexpParser(s)
+        parser = SexpParser(" ")
         result = parser.parse_sp()
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_sp_failure(self, s: str):
         """Test parsing non-space character fails"""
         parser = SexpParser(s)
@@ -59,15 +88,14 @@ class TestParseSpMethod:
 class TestParseHtabMethod:
     """Tests for parse_htab method (horizontal tab parsing)"""
 
-    @given(sexp_gen.htab)
-    def test_parse_htab_success(self, s: str):
+    def test_parse_htab_success(self):
         """Test parsing a horizontal tab character successfully"""
-        parser = SexpParser(s)
+        parser = SexpParser("\t")
         result = parser.parse_htab()
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_htab_failure(self, s: str):
         """Test parsing non-htab character fails"""
         parser = SexpParser(s)
@@ -80,15 +108,14 @@ class TestParseHtabMethod:
 class TestParseCrMethod:
     """Tests for parse_cr method (carriage return parsing)"""
 
-    @given(sexp_gen.cr)
-    def test_parse_cr_success(self, s: str):
+    def test_parse_cr_success(self):
         """Test parsing a carriage return character successfully"""
-        parser = SexpParser(s)
+        parser = SexpParser("\r")
         result = parser.parse_cr()
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_cr_failure(self, s: str):
         """Test parsing non-cr character fails"""
         parser = SexpParser(s)
@@ -118,15 +145,14 @@ class TestParseCrMethod:
 class TestParseLfMethod:
     """Tests for parse_lf method (line feed parsing)"""
 
-    @given(sexp_gen.lf)
-    def test_parse_lf_success(self, s: str):
+    def test_parse_lf_success(self):
         """Test parsing a line feed character successfully"""
-        parser = SexpParser(s)
+        parser = SexpParser("\n")
         result = parser.parse_lf()
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_lf_failure(self, s: str):
         """Test parsing non-lf character fails"""
         parser = SexpParser(s)
@@ -156,7 +182,7 @@ class TestParseLfMethod:
 class TestParseAlphaMethod:
     """Tests for parse_alpha method (alphabetic character parsing)"""
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_alpha_success(self, s: str):
         """Test parsing an alphabetic character successfully"""
         parser = SexpParser(s)
@@ -164,7 +190,7 @@ class TestParseAlphaMethod:
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.digit)
+    @pytest.mark.parametrize("s", _DIGITS)
     def test_parse_alpha_failure(self, s: str):
         """Test parsing non-alpha character fails"""
         parser = SexpParser(s)
@@ -190,11 +216,19 @@ class TestParseAlphaMethod:
         # Next character should be 'b'
         assert parser.peek() == "b"
 
+    @pytest.mark.parametrize("s", ["é", "ß", "Ω"])
+    def test_parse_alpha_non_ascii(self, s: str):
+        """Test parsing a non-ASCII alpha character fails"""
+        parser = SexpParser(s)
+        result = parser.parse_alpha()
+        assert result is False
+        assert parser.index == 0
+
 
 class TestParseDigitMethod:
     """Tests for parse_digit method (digit character parsing)"""
 
-    @given(sexp_gen.digit)
+    @pytest.mark.parametrize("s", _DIGITS)
     def test_parse_digit_success(self, s: str):
         """Test parsing a digit character successfully"""
         parser = SexpParser(s)
@@ -202,7 +236,7 @@ class TestParseDigitMethod:
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_digit_failure(self, s: str):
         """Test parsing non-digit character fails"""
         parser = SexpParser(s)
@@ -228,11 +262,19 @@ class TestParseDigitMethod:
         # Next character should be '2'
         assert parser.peek() == "2"
 
+    @pytest.mark.parametrize("s", ["٣", "²", "５"])
+    def test_parse_digit_non_ascii(self, s: str):
+        """Test parsing a non-ASCII digit character fails"""
+        parser = SexpParser(s)
+        result = parser.parse_digit()
+        assert result is False
+        assert parser.index == 0
+
 
 class TestParseHexdigitMethod:
     """Tests for parse_hexdigit method (hexadecimal digit parsing)"""
 
-    @given(sexp_gen.hexdig)
+    @pytest.mark.parametrize("s", _HEXDIGITS)
     def test_parse_hexdigit_success(self, s: str):
         """Test parsing a hex digit character successfully"""
         parser = SexpParser(s)
@@ -240,16 +282,14 @@ class TestParseHexdigitMethod:
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _NON_HEX_ALPHA)
     def test_parse_hexdigit_failure_alpha(self, s: str):
         """Test parsing non-hexdigit alpha character fails"""
-        # Filter out valid hex alpha chars
-        if s.lower() not in "abcdef":
-            parser = SexpParser(s)
-            result = parser.parse_hexdigit()
-            assert result is False
-            assert not parser.at_end()
-            assert parser.index == 0  # Should not consume anything
+        parser = SexpParser(s)
+        result = parser.parse_hexdigit()
+        assert result is False
+        assert not parser.at_end()
+        assert parser.index == 0  # Should not consume anything
 
     def test_parse_hexdigit_empty_string(self):
         """Test parsing hexdigit from empty string fails"""
@@ -268,30 +308,6 @@ class TestParseHexdigitMethod:
         # Next character should be '1'
         assert parser.peek() == "1"
 
-    def test_parse_hexdigit_uppercase(self):
-        """Test parsing uppercase hex digits"""
-        for char in "ABCDEF":
-            parser = SexpParser(char)
-            result = parser.parse_hexdigit()
-            assert result is True
-            assert parser.at_end()
-
-    def test_parse_hexdigit_lowercase(self):
-        """Test parsing lowercase hex digits"""
-        for char in "abcdef":
-            parser = SexpParser(char)
-            result = parser.parse_hexdigit()
-            assert result is True
-            assert parser.at_end()
-
-    def test_parse_hexdigit_digits(self):
-        """Test parsing numeric hex digits"""
-        for char in "0123456789":
-            parser = SexpParser(char)
-            result = parser.parse_hexdigit()
-            assert result is True
-            assert parser.at_end()
-
 
 class TestParseDquoteMethod:
     """Tests for parse_dquote method (double quote parsing)"""
@@ -303,7 +319,7 @@ class TestParseDquoteMethod:
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_dquote_failure(self, s: str):
         """Test parsing non-dquote character fails"""
         parser = SexpParser(s)
@@ -361,11 +377,12 @@ class TestParseOctetMethod:
 
     def test_parse_octet_unicode(self):
         """Test parsing unicode characters as octets"""
-        unicode_chars = ["€", "ñ", "中", "🙂"]
-        for char in unicode_chars:
-            parser = SexpParser(char)
+        parser = SexpParser("")
+        for char in "€ñ中🙂":
+            parser.reset(char)
             result = parser.parse_octet()
             assert result is True
+            assert parser.at_end()
 
 
 class TestParseVtabMethod:
@@ -378,7 +395,7 @@ class TestParseVtabMethod:
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_vtab_failure(self, s: str):
         """Test parsing non-vtab character fails"""
         parser = SexpParser(s)
@@ -414,7 +431,7 @@ class TestParseFfMethod:
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_ff_failure(self, s: str):
         """Test parsing non-ff character fails"""
         parser = SexpParser(s)
@@ -451,7 +468,7 @@ class TestParseWhitespaceMethod:
         assert result is True
         assert parser.at_end()
 
-    @given(sexp_gen.alpha)
+    @pytest.mark.parametrize("s", _ALPHA)
     def test_parse_whitespace_failure(self, s: str):
         """Test parsing non-whitespace character fails"""
         parser = SexpParser(s)
@@ -477,20 +494,77 @@ class TestParseWhitespaceMethod:
         assert parser.peek() == "\t"
 
 
-class TestParseBase64CharMethod:
-    """Tests for parse_base_64_char method (base64 character parsing)"""
+class TestSingleCharTruthTable:
+    """Every single-character rule against every ASCII character"""
 
     @pytest.mark.parametrize(
-        "char", list("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")
+        "method, accepted",
+        [
+            ("parse_sp", " "),
+            ("parse_htab", "\t"),
+            ("parse_cr", "\r"),
+            ("parse_lf", "\n"),
+            ("parse_alpha", _ALPHA),
+            ("parse_digit", _DIGITS),
+            ("parse_hexdigit", _HEXDIGITS),
+            ("parse_dquote", '"'),
+            ("parse_vtab", "\x0b"),
+            ("parse_ff", "\x0c"),
+            ("parse_whitespace", " \t\x0b\r\n"),
+        ],
     )
-    def test_parse_base_64_char_success(self, char):
-        """Test parsing valid base64 character successfully"""
-        parser = SexpParser(char)
-        result = parser.parse_base_64_char()
-        assert result is True
-        assert parser.at_end()
+    def test_ascii_truth_table(self, method, accepted):
+        """Test each rule accepts exactly its characters and nothing else"""
+        parser = SexpParser("")
+        parse = getattr(parser, method)
+        for code in range(128):
+            char = chr(code)
+            parser.reset(char)
+            assert parse() is (char in accepted), repr(char)
+            assert parser.index == (1 if char in accepted else 0)
+
 
-    @pytest.mark.parametrize("char", ["=", "-", "_", "*", "!", " "])
+class TestSkipWhitespaceMethod:
+    """Tests for skip_whitespace method (run of whitespace characters)"""
+
+    @pytest.mark.parametrize(
+        "input_str, expected",
+        [
+            ("", 0),
+            ("abc", 0),
+            (" abc", 1),
+            (" \t\x0b\r\nabc", 5),
+            ("   ", 3),
+            ("\x0cabc", 0),  # form feed is not consumed by parse_whitespace
+        ],
+    )
+    def test_skip_whitespace_various(self, input_str, expected):
+        parser = SexpParser(input_str)
+        result = parser.skip_whitespace()
+        assert result == expected
+        assert parser.index == expected
+
+    def test_skip_whitespace_from_middle(self):
+        parser = SexpParser("ab  cd")
+        parser.index = 2
+        result = parser.skip_whitespace()
+        assert result == 2
+        assert parser.peek() == "c"
+
+
+class TestParseBase64CharMethod:
+    """Tests for parse_base_64_char method (base64 character parsing)"""
+
+    def test_parse_base_64_char_success(self):
+        """Test parsing every valid base64 character successfully"""
+        parser = SexpParser("")
+        for char in _BASE_64_ALPHABET:
+            parser.reset(char)
+            result = parser.parse_base_64_char()
+            assert result is True, char
+            assert parser.at_end()
+
+    @pytest.mark.parametrize("char", ["=", "-", "_", "*", "!", " ", "é", "٣"])
     def test_parse_base_64_char_failure(self, char):
         """Test parsing invalid base64 character fails"""
         parser = SexpParser(char)
@@ -537,26 +611,8 @@ class TestParseBase64CharsMethod:
         parser = SexpParser(input_str)
         count = parser.parse_base_64_chars()
         assert count == expected_count
-        # Should consume only the valid base64 chars and whitespace
-        # If expected_count == 0, index should be 0
-        if expected_count == 0:
-            assert parser.index == 0
-        else:
-            # Should consume up to the last valid group
-            # Find where parsing should stop
-            i = 0
-            chars = 0
-            while i < len(input_str) and chars < expected_count:
-                if (
-                    input_str[i]
-                    in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
-                ):
-                    chars += 1
-                i += 1
-            # Allow for whitespace after each base64 char
-            while i < len(input_str) and input_str[i].isspace():
-                i += 1
-            assert parser.index >= expected_count
+        # Every case is whole groups, so all chars and whitespace are consumed
+        assert parser.index == len(input_str)
 
     def test_parse_base_64_chars_with_extra_non_base64(self):
         parser = SexpParser("ABCD!WXYZ")
@@ -614,8 +670,8 @@ class TestParseBase64EndMethod:
         parser = SexpParser(input_str)
         count = parser.parse_base_64_end()
         assert count == expected_count
-        # Should consume up to the padding
-        assert parser.index >= len(input_str.rstrip())
+        # Should consume the padding and any trailing whitespace
+        assert parser.index == len(input_str)
 
     @pytest.mark.parametrize(
         "input_str, expected_count",
@@ -629,7 +685,7 @@ class TestParseBase64EndMethod:
         parser = SexpParser(input_str)
         count = parser.parse_base_64_end()
         assert count == expected_count
-        assert parser.index >= len(input_str.rstrip())
+        assert parser.index == len(input_str)
 
     def test_parse_base_64_end_with_whitespace(self):
         parser = SexpParser("ABCD \t\n")
@@ -653,6 +709,7 @@ class TestParseDecimalMethod:
             ("", None),
             ("abc", None),
             (" 123", None),
+            ("٣", None),  # DIGIT is ASCII only
         ],
     )
     def test_parse_decimal_various(self, input_str, expected):
@@ -661,13 +718,7 @@ class TestParseDecimalMethod:
         assert result == expected
         if expected is not None:
             # Should consume all contiguous digit characters
-            digit_count = 0
-            for c in input_str:
-                if c.isdigit():
-                    digit_count += 1
-                else:
-                    break
-            assert parser.index == digit_count
+            assert parser.index == _DIGIT_PREFIX.match(input_str).end()
         else:
             assert parser.index == 0
 
@@ -732,6 +783,13 @@ class TestParseBase64Method:
             parser.parse_base_64()
         assert "Invalid base64 character" in str(excinfo.value)
 
+    def test_parse_base_64_non_ascii_char(self):
+        parser = SexpParser("|YWJé|")
+        with pytest.raises(ValueError) as excinfo:
+            parser.parse_base_64()
+        assert "Invalid base64 character 'é' at position 4" in str(excinfo.value)
+        assert parser.index == 4
+
     def test_parse_base_64_decode_error(self):
         # Invalid base64 padding
         parser = SexpParser("|YWJj===")
@@ -795,13 +853,7 @@ class TestParseHexadecimalMethod:
         assert result == expected
         if expected is not None:
             # Should consume only the hex digits
-            hex_part = ""
-            for c in input_str:
-                if c.lower() in "0123456789abcdef":
-                    hex_part += c
-                else:
-                    break
-            assert parser.index == len(hex_part)
+            assert parser.index == _HEX_PREFIX.match(input_str).end()
         else:
             assert parser.index == 0
 